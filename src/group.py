@@ -1,8 +1,9 @@
-from typing import Iterable
+import sys
+from bisect import bisect_right, insort
+from typing import Iterable, Mapping
 
 from src.util import (
     generate_contractions,
-    apply_rule_once,
     get_inverse_rep,
     get_most_shaveds,
     expand_notation,
@@ -10,6 +11,8 @@ from src.util import (
     anti_cap,
 )
 from src.my_types import strings
+from src.rule_automaton import RuleAutomaton
+from src.union_find import UnionFind
 from src.exceptions import IncompleteGroupException
 
 
@@ -54,14 +57,44 @@ class Group:
         self._name: str = name
         self._sink_cap: int = sink_cap
 
-        # `self._reps_to_sinks` is gonna contain all reps of group elements we have encountered,
-        # with a reference to the most reduced currently discovered rep
-        self._reps_to_sinks: dict[str, str] = {}
-
         self._prime_reductibles: set[str] = set()
+        # The same prime reductibles, sorted by `self._rep_sort_key`, such that we can find the ones
+        # that are less reduced than some rep with a bisection
+        self._sorted_prime_reductibles: list[str] = []
+        # Finds occurrences of all `self._prime_reductibles` at once, rebuilt lazily when they change
+        self._prime_automaton: RuleAutomaton | None = None
         self._generator_chars: set[str] = set()
         self._inverse_chars: set[str] = set()
-        self._sinks: set[str] = set()
+
+        # Sort keys depend on `self._inverse_chars`, so this cache is cleared when we find a new inverse char
+        self._rep_sort_key_cache: dict[str, tuple[int, str]] = {}
+
+        # `self._reps_to_sinks` is gonna contain all reps of group elements we have encountered,
+        # grouped into classes of equivalent reps, each with the most reduced currently discovered rep as sink.
+        # The sinks themselves are kept track of in `self._reps_to_sinks.sinks`.
+        self._reps_to_sinks: UnionFind = UnionFind(self._rep_sort_key)
+
+        # `self._state_version` is bumped whenever `self._prime_reductibles` changes, or the sink of any
+        # established rep changes. Results that only depend on those can be cached for as long as it stays the same.
+        self._state_version: int = 0
+        self._should_be_prime_reductible_cache: dict[str, bool] = {}
+        self._should_be_prime_reductible_cache_version: int = 0
+        self._prime_reductibles_to_sinks: dict[str, str] = {}
+        self._prime_reductibles_to_sinks_version: int = -1
+        # For every contraction of prime reductibles we integrated, the state version right after doing so
+        self._contraction_integration_versions: dict[str, int] = {}
+
+        # All combinations of a sink and a generator char whose composition isn't in `self._reps_to_sinks` yet
+        self._missing_pairs: set[tuple[str, str]] = set()
+
+        # The state version at which we last made sure no sink or prime reductible contains another
+        # prime reductible, and whether we're doing so right now, see `self._integrate_reducible_sinks`
+        self._reducible_sinks_version: int = -1
+        self._integrating_reducible_sinks: bool = False
+
+        # All combinations of reps we've been told describe the same element, including the ones
+        # relating generator chars to their inverses, so we can check our findings against them
+        self._relations: list[strings] = []
 
         if initial_reps_elements is None:
             initial_reps_elements = tuple()
@@ -70,8 +103,9 @@ class Group:
         self._integrate([""])
 
         for reps in initial_reps_elements:
-            expanded_reps = [expand_notation(rep) for rep in reps]
+            expanded_reps = [sys.intern(expand_notation(rep)) for rep in reps]
             self._update_generator_chars(expanded_reps)
+            self._relations.append(expanded_reps)
             self._integrate(expanded_reps)
 
         # Infer the group structure
@@ -98,21 +132,26 @@ class Group:
             for the element represented by `expanded_reps`.
         """
         all_relevant_equivalent_reps: set[str] = find_all_reachable_representations(
-            expanded_reps, self._reps_to_sinks, self._prime_reductibles
+            expanded_reps, self._reps_to_sinks, self._get_prime_automaton()
         )
 
         most_reduced: str = min(all_relevant_equivalent_reps, key=self._rep_sort_key)
 
+        # Local references to what we call for every rep below, saving a lookup per call
+        set_entry = self._set_entry
+        integrate = self._integrate
+        shave = get_most_shaveds
+
         for rep in all_relevant_equivalent_reps:
             # Establish equivalence between `rep` and `most_reduced` in `self._reps_to_sinks`
-            self._set_entry(rep, most_reduced)
+            set_entry(rep, most_reduced)
 
             # If `rep` is a sink, we can continue, because the rest of this block is only for
             # integrating shaved versions of `rep` and `most_reduced`
             if rep == most_reduced:
                 continue
 
-            most_shaveds: set[tuple[str, str]] = get_most_shaveds(rep, most_reduced)
+            most_shaveds: frozenset[tuple[str, str]] = shave(rep, most_reduced)
             for most_shaved in most_shaveds:
                 rep_shaved, most_reduced_shaved = most_shaved
 
@@ -120,9 +159,56 @@ class Group:
                 if rep == rep_shaved:
                     continue
 
-                self._integrate([rep_shaved, most_reduced_shaved])
+                integrate([rep_shaved, most_reduced_shaved])
+
+        # New prime reductibles or merged classes might have made some established sinks and primes reducible
+        if self._reducible_sinks_version != self._state_version:
+            self._integrate_reducible_sinks()
+
+        return self._reps_to_sinks[most_reduced]
+
+    def _integrate_reducible_sinks(self) -> None:
+        """Integrates all sinks and prime reductibles that contain a prime reductible, together with the reps
+        we can reduce them to.
+
+        A sink we established before some prime reductible was discovered might contain that prime reductible,
+        in which case it isn't actually the most reduced rep of its element. Searching from such a sink
+        wouldn't find that out, because we always go straight from an established rep to its sink,
+        so we need to apply the prime reductibles in it explicitly. The same goes for prime reductibles that
+        contain other prime reductibles, because reducing those might lead to a different sink than their own.
+        Integrating those can lead to new prime reductibles and merges itself, so we repeat this
+        until nothing changes anymore.
+        """
+        # We might get here again through `self._integrate` below, in which case the loop below takes care of it
+        if self._integrating_reducible_sinks:
+            return
+
+        self._integrating_reducible_sinks = True
+        try:
+            while self._reducible_sinks_version != self._state_version:
+                self._reducible_sinks_version = self._state_version
+                for rep in [
+                    *self._reps_to_sinks.sinks,
+                    *self._sorted_prime_reductibles,
+                ]:
+                    # Earlier integrations in this loop might have merged `rep` into another class,
+                    # or removed it from the prime reductibles
+                    if (
+                        rep not in self._reps_to_sinks.sinks
+                        and rep not in self._prime_reductibles
+                    ):
+                        continue
 
-        return most_reduced
+                    # Don't use `rep` to reduce `rep`
+                    reductions = {
+                        rep[:start] + self._reps_to_sinks[left] + rep[end:]
+                        for start, end, left in self._get_prime_automaton().matches(rep)
+                        if left != rep
+                    }
+                    if reductions:
+                        self._integrate((rep, *reductions))
+        finally:
+            self._integrating_reducible_sinks = False
 
     def _set_entry(
         self, rep: str, new_reduced: str, process_for_primes: bool = True
@@ -130,9 +216,10 @@ class Group:
         """Processes the information that `rep` can be reduced to `new_reduced`.
 
         In this function, the following things happen:
-        - Check if `rep` is already in `self._reps_to_sinks`. If so, we have discovered
-        that two reps that were both considered sinks so far, are actually equivalent.
-        - Otherwise we register `rep` in `self._reps_to_sinks` with a reference to `new_reduced`.
+        - Check if `rep` is already in `self._reps_to_sinks`. If so, we might have discovered
+        that two reps that were both considered sinks so far, are actually equivalent,
+        in which case we merge their classes.
+        - Otherwise we register `rep` in `self._reps_to_sinks` in the class of `new_reduced`.
         - If `rep` is not a sink, we process it as a potential prime reductible.
 
         Parameters
@@ -149,87 +236,139 @@ class Group:
             If we add `new_reduced` as a new sink, we check whether we haven't exceeded
             the number of sinks we wanna allow.
         """
-        if rep in self._reps_to_sinks:
-            known_reduced = self._reps_to_sinks[rep]
-            if new_reduced == known_reduced:
+        known_reduced = self._reps_to_sinks.get(rep)
+        if known_reduced is not None:
+            other_reduced = self._reps_to_sinks.get(new_reduced)
+            if other_reduced is None:
+                self._register(new_reduced)
+                other_reduced = new_reduced
+
+            # If `rep` is established in the same class as `new_reduced`, there is nothing new to process
+            if known_reduced == other_reduced:
                 return
 
-            # If `rep` is established but refers to a representation different from `new_reduced`,
-            # we have discovered a new equivalence.
-            most_reduced, less_reduced = sorted(
-                (known_reduced, new_reduced), key=self._rep_sort_key
+            # Otherwise we have discovered a new equivalence. All reps that now refer to a different sink
+            # might be part of `self._prime_reductibles`, so we should check if we need to update their status.
+            moveds = self._reps_to_sinks.union(rep, new_reduced)
+            self._state_version += 1
+
+            # The sink that didn't survive doesn't need a complete image anymore
+            less_reduced = (
+                other_reduced
+                if known_reduced in self._reps_to_sinks.sinks
+                else known_reduced
             )
+            self._missing_pairs.difference_update(
+                (less_reduced, g) for g in self._generator_chars
+            )
+
+            self._process_as_potential_prime_reductibles(moveds)
 
-            self._set_for_entries_with_value(less_reduced, most_reduced)
             # The rest of this function only deals with representations we haven't encountered before.
             return
 
-        self._reps_to_sinks[rep] = new_reduced
-        self._sinks.add(new_reduced)
+        # From here on `rep` is stored in several places, which can then all share the same string object
+        rep = sys.intern(rep)
 
         # If `rep` and `new_reduced` are equal, `rep` is a sink, and can't be used as a reduction rule
         if rep == new_reduced:
-            if len(self._sinks) > self._sink_cap:
+            self._register(rep)
+            if len(self._reps_to_sinks.sinks) > self._sink_cap:
                 raise MemoryError("Too many sinks")
             return
 
+        self._register(rep, new_reduced)
+
         if process_for_primes:
-            self._process_as_potential_prime_reductible(rep)
+            self._process_as_potential_prime_reductibles((rep,))
 
-    def _set_for_entries_with_value(self, old_value: str, new_value: str) -> None:
-        """Changes all references to `old_value` in `self._reps_to_sinks` into references to `new_value`.
+    def _register(self, rep: str, sink: str | None = None) -> None:
+        """Adds `rep` to `self._reps_to_sinks`, and keeps `self._missing_pairs` up to date.
 
         Parameters
         ----------
-        old_value : str
-            The representation we're gonna replace with `new_value` in `self._reps_to_sinks`
-        new_value : str
-            The representation with which we're gonna replace `old_value`
+        rep : str
+            The representation to add, which should not be in `self._reps_to_sinks` yet.
+        sink : str | None, optional
+            The rep whose class `rep` should join, by default None, meaning `rep` becomes a new sink.
         """
-        if old_value == new_value or old_value not in self._sinks:
-            return
+        if sink is not None and sink not in self._reps_to_sinks:
+            self._register(sink)
 
-        for unreduced, reduced in self._reps_to_sinks.items():
-            if reduced == old_value:
-                self._reps_to_sinks[unreduced] = new_value
+        self._reps_to_sinks.add(rep, sink)
 
-                # `unreduced` might be part of `self._prime_reductibles`, but if it is, it now refers
-                # to a different sink, so we should check if we need to update its status.
-                self._process_as_potential_prime_reductible(unreduced)
+        # `rep` might be the composition of a sink and a generator char we were still missing
+        if rep:
+            self._missing_pairs.discard((rep[:-1], rep[-1]))
 
-        self._sinks.remove(old_value)
-        self._sinks.add(new_value)
+        # If `rep` is a new sink, we need its image over all generator chars
+        if sink is None:
+            self._missing_pairs.update(
+                (rep, g)
+                for g in self._generator_chars
+                if rep + g not in self._reps_to_sinks
+            )
 
-    def _process_as_potential_prime_reductible(self, rep: str) -> None:
-        """Checks if `rep` is prime reductible, and if so, processes it as such.
+    def _process_as_potential_prime_reductibles(self, reps: strings) -> None:
+        """Checks for all `reps` if they are prime reductible, and if so, processes them as such.
 
-        This means we add it to `self._prime_reductibles`, and then we check for all previously established
+        This means we add them to `self._prime_reductibles`, and then we check for all previously established
         prime reductibles whether they still are, and if not, we remove them from `self._prime_reductibles`.
+        When a merge of two sinks hands us a whole batch of reps, we only do this second check once.
+        Reps in `reps` that already are prime reductibles might not be anymore, because their sink changed,
+        in which case we remove them straight away.
 
         Parameters
         ----------
-        rep : str
-            Reprenestation to be processed.
+        reps : strings
+            Reprenestations to be processed.
         """
-        if not self._should_be_prime_reductible(rep):
+        new_primes: list[str] = []
+        former_primes: list[str] = []
+        for rep in reps:
+            if self._should_be_prime_reductible(rep):
+                new_primes.append(rep)
+            elif rep in self._prime_reductibles:
+                former_primes.append(rep)
+
+        for rep in former_primes:
+            self._prime_reductibles.remove(rep)
+            self._sorted_prime_reductibles.remove(rep)
+            self._prime_automaton = None
+            self._state_version += 1
+
+        if not new_primes:
             return
 
-        self._prime_reductibles.add(rep)
-
-        # Check whether the other reps in `self._prime_reductibles` should remain in there
-        for established_prime in tuple(self._prime_reductibles):
-            # If `rep` is not more reduced than `established_prime`, we can't possibly reduce
-            if self._rep_sort_key(rep) >= self._rep_sort_key(established_prime):
-                continue
-
-            if not self._should_be_prime_reductible(established_prime):
+        for rep in new_primes:
+            if rep not in self._prime_reductibles:
+                self._prime_reductibles.add(rep)
+                insort(self._sorted_prime_reductibles, rep, key=self._rep_sort_key)
+                self._prime_automaton = None
+                self._state_version += 1
+
+        # Check whether the other reps in `self._prime_reductibles` should remain in there.
+        # If none of `new_primes` is more reduced than an established prime, we can't possibly reduce it,
+        # so we only check the ones after the most reduced of `new_primes`.
+        most_reduced_key = min(self._rep_sort_key(rep) for rep in new_primes)
+        first_less_reduced = bisect_right(
+            self._sorted_prime_reductibles, most_reduced_key, key=self._rep_sort_key
+        )
+        should_be_prime_reductible = self._should_be_prime_reductible
+        for established_prime in self._sorted_prime_reductibles[first_less_reduced:]:
+            if not should_be_prime_reductible(established_prime):
                 self._prime_reductibles.remove(established_prime)
+                self._sorted_prime_reductibles.remove(established_prime)
+                self._prime_automaton = None
+                self._state_version += 1
 
     def _should_be_prime_reductible(self, rep: str) -> bool:
         """Assesses whether `rep` is a prime reductible for the current state of this `Group` object.
 
         If we can not reduce `rep` to its associated sink in `self._reps_to_sinks` by using the currently
         established `self._prime_reductibles`, it should itself be considered a prime reductible.
+        The outcome only depends on `self._prime_reductibles` and their sinks, so we cache it
+        for as long as `self._state_version` doesn't change.
 
         Parameters
         ----------
@@ -241,23 +380,54 @@ class Group:
         bool
             Whether `rep` is a prime reductible.
         """
-        # Don't use `rep` to try and reduce `rep`
-        other_prime_reductibles = self._prime_reductibles - {rep}
-        allowed_references = {
-            prime: self._reps_to_sinks[prime] for prime in other_prime_reductibles
-        }
+        if self._should_be_prime_reductible_cache_version != self._state_version:
+            self._should_be_prime_reductible_cache.clear()
+            self._should_be_prime_reductible_cache_version = self._state_version
+        elif rep in self._should_be_prime_reductible_cache:
+            return self._should_be_prime_reductible_cache[rep]
 
+        # Don't use `rep` to try and reduce `rep`
         reachable_representations_from_rep = find_all_reachable_representations(
             (rep,),
-            allowed_references,
-            other_prime_reductibles,
+            self._get_prime_reductibles_to_sinks(),
+            self._get_prime_automaton(),
+            exclude=rep,
+            target=self._reps_to_sinks[rep],
         )
 
         should_be_prime = (
             self._reps_to_sinks[rep] not in reachable_representations_from_rep
         )
+        self._should_be_prime_reductible_cache[rep] = should_be_prime
         return should_be_prime
 
+    def _get_prime_reductibles_to_sinks(self) -> dict[str, str]:
+        """Maps all `self._prime_reductibles` to their sinks, rebuilt only when `self._state_version` changes.
+
+        Returns
+        -------
+        dict[str, str]
+            The prime reductibles, each referring to their sink.
+        """
+        if self._prime_reductibles_to_sinks_version != self._state_version:
+            self._prime_reductibles_to_sinks = {
+                prime: self._reps_to_sinks[prime] for prime in self._prime_reductibles
+            }
+            self._prime_reductibles_to_sinks_version = self._state_version
+        return self._prime_reductibles_to_sinks
+
+    def _get_prime_automaton(self) -> RuleAutomaton:
+        """Returns the automaton over `self._prime_reductibles`, building it if they changed since last time.
+
+        Returns
+        -------
+        RuleAutomaton
+            Automaton that finds all occurrences of all prime reductibles in a rep in one pass.
+        """
+        if self._prime_automaton is None:
+            self._prime_automaton = RuleAutomaton(self._prime_reductibles)
+        return self._prime_automaton
+
     def _update_generator_chars(self, reps: strings) -> None:
         """Adds all individual characters in the elements in `reps` to `self._generator_chars`.
 
@@ -275,20 +445,29 @@ class Group:
             if g in self._generator_chars or g in self._inverse_chars:
                 continue
 
-            # Otherwise we add it now
+            # Otherwise we add it now, which means we also need the image over `g` for all sinks
             self._generator_chars.add(g)
+            self._missing_pairs.update(
+                (sink, g)
+                for sink in self._reps_to_sinks.sinks
+                if sink + g not in self._reps_to_sinks
+            )
 
             # And we'll add the inverse to our inverse set, and establish their relation
             g_inverse = anti_cap(g)
             self._inverse_chars.add(g_inverse)
+            self._rep_sort_key_cache.clear()
+            self._sorted_prime_reductibles.sort(key=self._rep_sort_key)
+            self._relations.append((g + g_inverse, g_inverse + g, ""))
             self._integrate((g + g_inverse, g_inverse + g, ""))
 
     def _determine_first_element_with_incomplete_image(self) -> tuple[str, str] | None:
         """Some elements might not have a complete image.
 
-        This function will check all established sinks `sink`, and all generator chars `g`,
-        to see if we have established the representations `sink` + `g`. If not, we don't establish it now,
-        but return the combination
+        This function will check whether there are established sinks `sink` and generator chars `g`,
+        for which we haven't established the representation `sink` + `g`. If so, we don't establish it now,
+        but return the combination. These combinations are kept track of in `self._missing_pairs`,
+        which is updated whenever we add a rep, a sink, or a generator char.
 
         Returns
         -------
@@ -296,15 +475,15 @@ class Group:
             The combination of `sink` and `g`, or `None` if all compositions of sinks and generator chars
             have already been established.
         """
-        for sink in self._sinks:
-            for generator_char in self._generator_chars:
-                if sink + generator_char not in self._reps_to_sinks:
-                    return (sink, generator_char)
+        return next(iter(self._missing_pairs), None)
 
-        return None
+    def _rep_sort_key(self, s: str) -> tuple[int, str]:
+        """A sort key that will sort strings based on the number of inverse characters, then length,
+        and then on the value itself.
 
-    def _rep_sort_key(self, s: str) -> tuple[int, int, str]:
-        """A sort key that will sort strings based on length, and then on the value itself.
+        The number of inverse characters and the length are packed into a single integer,
+        so most comparisons between keys are a single integer comparison,
+        and we only compare `s` itself if both are equal.
 
         Parameters
         ----------
@@ -314,9 +493,15 @@ class Group:
         Returns
         -------
         tuple[int, str]
-            A tuple containing the length of `s`, and `s` itself secundarily.
+            A tuple containing the number of inverse characters and length of `s` packed together,
+            and `s` itself secundarily.
         """
-        return (self._count_inverse_characters(s), len(s), s)
+        if s in self._rep_sort_key_cache:
+            return self._rep_sort_key_cache[s]
+
+        key = ((self._count_inverse_characters(s) << 32) | len(s), s)
+        self._rep_sort_key_cache[s] = key
+        return key
 
     def _count_inverse_characters(self, s: str) -> int:
         """Counts how many occurences of inverse characters are in `s`
@@ -331,6 +516,9 @@ class Group:
         int
             Number of inverse characters.
         """
+        # Counting with `str.count` per inverse character runs in C, which pays off unless `s` is very short
+        if len(s) > len(self._inverse_chars):
+            return sum(map(s.count, self._inverse_chars))
         return sum(1 for char in s if char in self._inverse_chars)
 
     def __str__(self) -> str:
@@ -356,24 +544,19 @@ class Group:
         """
         name_string = f"Group with name: {self._name}"
 
-        sinks_sorted = list(sorted(self._sinks, key=self._rep_sort_key))
-        sinks_compressed = [compress_notation(sink) for sink in sinks_sorted]
-        sinks_string = f"Sinks:\n{sinks_compressed}"
-
-        prime_reductibles_sorted = list(
-            sorted(self._prime_reductibles, key=self._rep_sort_key)
+        sinks_sorted = sorted(self._reps_to_sinks.sinks, key=self._rep_sort_key)
+        sinks_string = "Sinks:\n" + ", ".join(
+            compress_notation(sink) for sink in sinks_sorted
         )
-        prime_reductibles_compressed = [
+
+        prime_reductibles_string = "Prime reductibles:\n" + "\n".join(
             f"{compress_notation(prime)} -> {compress_notation(self._reps_to_sinks[prime])}"
-            for prime in prime_reductibles_sorted
-        ]
-        prime_reductibles_string = (
-            f"Prime reductibles:\n{'\n'.join(prime_reductibles_compressed)}"
+            for prime in self._sorted_prime_reductibles
         )
 
         sink_g = self._determine_first_element_with_incomplete_image()
         completeness_string = (
-            "Complete" + (" (trivially)" if len(self._sinks) == 1 else "")
+            "Complete" + (" (trivially)" if len(self._reps_to_sinks.sinks) == 1 else "")
             if sink_g is None
             else f"Incomplete, missing {compress_notation(''.join(sink_g))}"
         )
@@ -384,8 +567,9 @@ class Group:
 
     def __call__(self, *reps: str) -> None:
         """Integrates `reps`, and prints the most reduced representation for it, and the group itself."""
-        expanded_reps = [expand_notation(rep) for rep in reps]
+        expanded_reps = [sys.intern(expand_notation(rep)) for rep in reps]
         self._update_generator_chars(expanded_reps)
+        self._relations.append(expanded_reps)
         most_reduced = self._integrate(expanded_reps)
         print(f"Most reduced: {compress_notation(most_reduced)}")
         print(self)
@@ -401,34 +585,130 @@ class Group:
         as representations of the same element, hopefully leading to the discovery of equivalences.
         """
         while not self.is_complete():
-            sorted_prime_reductibles: list[str] = sorted(
-                self._prime_reductibles, key=self._rep_sort_key
-            )
-
-            # Check for all combinations of prime reductibles, including reductibles with themselves
-            for i, s1 in enumerate(sorted_prime_reductibles):
-                for s2 in sorted_prime_reductibles[i:]:
-                    # We might already have removed one of them
-                    if (
-                        s1 not in self._prime_reductibles
-                        or s2 not in self._prime_reductibles
-                    ):
+            # A copy, because `self._sorted_prime_reductibles` changes while we integrate the contractions
+            sorted_prime_reductibles: list[str] = self._sorted_prime_reductibles.copy()
+
+            # First generate the contractions for all combinations of prime reductibles,
+            # including reductibles with themselves
+            pairs_with_contractions: list[tuple[str, str, frozenset[str]]] = [
+                (s1, s2, generate_contractions(s1, s2))
+                for i, s1 in enumerate(sorted_prime_reductibles)
+                for s2 in sorted_prime_reductibles[i:]
+            ]
+
+            # Then integrate them. Different pairs often lead to the same contraction, and the same pairs
+            # come back in every iteration, but integrating a contraction again only makes sense
+            # if we've learned something since the last time.
+            prime_reductibles = self._prime_reductibles
+            integration_versions = self._contraction_integration_versions
+            for s1, s2, contractions in pairs_with_contractions:
+                # We might already have removed one of them
+                if s1 not in prime_reductibles or s2 not in prime_reductibles:
+                    continue
+                for contraction in contractions:
+                    if integration_versions.get(contraction) == self._state_version:
                         continue
-                    contractions: set[str] = generate_contractions(s1, s2)
-                    for contraction in contractions:
-                        self._integrate((contraction,))
+                    self._integrate((contraction,))
+                    integration_versions[contraction] = self._state_version
 
             # If we did not find any new primes, we have nothing left to try
             if set(sorted_prime_reductibles) == self._prime_reductibles:
                 break
 
     def fill_in_gaps(self) -> None:
-        """Add representations for combinations of sinks and generator chars that haven't been established."""
-        while (
-            sink_and_g := self._determine_first_element_with_incomplete_image()
-        ) is not None:
-            sink, g = sink_and_g
-            self._integrate((sink + g,))
+        """Add representations for combinations of sinks and generator chars that haven't been established.
+
+        Once all of them are, we check whether what we've found is consistent with everything we know
+        (see `self._integrate_inconsistencies`), and if that teaches us anything new, we start over.
+        """
+        while True:
+            while (
+                sink_and_g := self._determine_first_element_with_incomplete_image()
+            ) is not None:
+                sink, g = sink_and_g
+                self._integrate((sink + g,))
+
+            if not self._integrate_inconsistencies():
+                break
+
+    def _integrate_inconsistencies(self) -> bool:
+        """Checks whether the established equivalences are consistent, and integrates what we learn if not.
+
+        Two things can be inconsistent, even when all sinks have a complete image:
+        - A rep we established before some prime reductible was discovered might contain that prime reductible,
+        while applying it leads to a rep in a different class. We don't find that out while integrating,
+        because we always go straight from an established rep to its sink.
+        - Following the images of a sink over the characters of the reps in a relation should lead to the same
+        sink for all of those reps, and following the images of the identity over the characters of a sink
+        should lead to that sink itself. Otherwise, we've missed an equivalence.
+        If neither of those happens, every sink represents a different element, and we've found all of them.
+
+        Returns
+        -------
+        bool
+            Whether we've learned anything new, in which case some sinks might have an incomplete image again.
+        """
+        state_version = self._state_version
+
+        # Local references to what we need for every rep below, refreshed whenever we've integrated something
+        get_sink = self._reps_to_sinks.get
+        prime_reductibles_to_sinks = self._get_prime_reductibles_to_sinks()
+        matches = self._get_prime_automaton().matches
+
+        for rep in list(self._reps_to_sinks):
+            sink = get_sink(rep)
+            # Don't use `rep` to reduce `rep`
+            reductions = [
+                rep[:start] + prime_reductibles_to_sinks[left] + rep[end:]
+                for start, end, left in matches(rep)
+                if left != rep
+            ]
+            if any(get_sink(reduction, sink) != sink for reduction in reductions):
+                self._integrate((rep, *reductions))
+                prime_reductibles_to_sinks = self._get_prime_reductibles_to_sinks()
+                matches = self._get_prime_automaton().matches
+
+        if self._state_version != state_version or not self.is_complete():
+            return True
+
+        for sink in list(self._reps_to_sinks.sinks):
+            # Earlier integrations in this loop might have merged `sink` into another class
+            if sink not in self._reps_to_sinks.sinks:
+                continue
+
+            ends_per_relation = [
+                [self._follow_images(sink, rep) for rep in reps]
+                for reps in self._relations
+            ]
+            ends_per_relation.append([self._follow_images("", sink), sink])
+            for ends in ends_per_relation:
+                if len(set(ends)) > 1:
+                    self._integrate(ends)
+
+        # New sinks we might have found on the way don't have a complete image yet
+        return self._state_version != state_version or not self.is_complete()
+
+    def _follow_images(self, sink: str, rep: str) -> str:
+        """Follows the images of `sink` over all characters in `rep`, one character at a time.
+
+        We don't keep track of images over inverse chars, so we integrate those when we need them.
+
+        Parameters
+        ----------
+        sink : str
+            The sink to start from.
+        rep : str
+            The characters whose images to follow.
+
+        Returns
+        -------
+        str
+            The sink we end up at, which represents the same element as `sink` + `rep`.
+        """
+        for char in rep:
+            image = self._reps_to_sinks.get(sink + char)
+            sink = self._integrate((sink + char,)) if image is None else image
+        return sink
 
     def is_complete(self) -> bool:
         """True if there are no more combinations of sinks and generator chars that haven't been established.
@@ -438,7 +718,7 @@ class Group:
         bool
             ...
         """
-        return self._determine_first_element_with_incomplete_image() is None
+        return not self._missing_pairs
 
     def get_sink_for(self, s: str) -> str:
         """If the `Group` object is complete, this will find the sink of `s` very quickly.
@@ -464,35 +744,48 @@ class Group:
         if not self.is_complete():
             raise IncompleteGroupException()
 
-        # This function uses recursion, but we don't want to check `self._is_complete()`
-        # every recursive call, so once we've asserted completeness, we can just use this nested function
-        def get_sink_rec(s_expanded: str) -> str:
-            # If we've already encountered `s`, we can just return its associated sink
-            if s_expanded in self._reps_to_sinks:
-                sink = self._reps_to_sinks[s_expanded]
-                return sink
+        s_expanded = expand_notation(s)
 
-            # Otherwise we'll split `s` in two, and reduce the halves individually
-            half_len: int = len(s_expanded) // 2
-            first_half: str = get_sink_rec(s_expanded[:half_len])
-            second_half: str = get_sink_rec(s_expanded[half_len:])
-            reduced = first_half + second_half  # equivalent to `s`
+        # We split `s_expanded` in halves, and those halves in halves, etc., until we reach segments
+        # we've already encountered. We collect these segments top-down, as (start, end) pairs.
+        segments: list[tuple[int, int]] = [(0, len(s_expanded))]
+        for start, end in segments:
+            if end - start > 1 and s_expanded[start:end] not in self._reps_to_sinks:
+                middle = start + (end - start) // 2
+                segments.append((start, middle))
+                segments.append((middle, end))
+
+        # Then we find their sinks bottom-up, such that the sinks of both halves of a segment are always known
+        sinks_of_segments: dict[tuple[int, int], str] = {}
+        for start, end in reversed(segments):
+            segment = s_expanded[start:end]
+
+            # If we've already encountered `segment`, we can just use its associated sink
+            sink = self._reps_to_sinks.get(segment)
+            if sink is not None:
+                sinks_of_segments[(start, end)] = sink
+                continue
 
-            if reduced in self._reps_to_sinks:
-                sink = self._reps_to_sinks[reduced]
+            # A single character we haven't encountered can't be split, so we integrate it as is
+            if end - start == 1:
+                sinks_of_segments[(start, end)] = self._integrate((segment,))
+                continue
 
-                # Cache the equivalence
-                self._set_entry(s_expanded, sink, False)
-                return sink
+            middle = start + (end - start) // 2
+            reduced = (
+                sinks_of_segments[(start, middle)] + sinks_of_segments[(middle, end)]
+            )  # equivalent to `segment`
 
             # If this still doesn't work, we can integrate `reduced`
-            sink = self._integrate((reduced,))
-            self._set_entry(s_expanded, sink, False)
-            return sink
+            sink = self._reps_to_sinks.get(reduced)
+            if sink is None:
+                sink = self._integrate((reduced,))
 
-        s_expanded = expand_notation(s)
-        sink = get_sink_rec(s_expanded)
-        return sink
+            # Cache the equivalence
+            self._set_entry(segment, sink, False)
+            sinks_of_segments[(start, end)] = sink
+
+        return sinks_of_segments[(0, len(s_expanded))]
 
     def get_inverse_of(self, s: str) -> str:
         """If the `Group` object is complete, this will find the inverse of `s`.
@@ -524,32 +817,40 @@ class Group:
 
 def find_all_reachable_representations(
     reps: strings,
-    reps_to_sinks: dict[str, str],
-    prime_reductibles: set[str],
-    all_equivalent_reps: set[str] | None = None,
+    reps_to_sinks: Mapping[str, str],
+    prime_automaton: RuleAutomaton,
+    exclude: str | None = None,
+    target: str | None = None,
 ) -> set[str]:
-    """Recursively searches for all accessible reduced versions of `reps` with the provided inputs.
+    """Searches for all accessible reduced versions of `reps` with the provided inputs.
 
-    This is done by looping over all `rep` in `reps`, and checking whether we've encountered it before
-    during this recurive search, or whether it exists in `reps_to_sinks`. If so, we can assume equivalence
+    This is done by going over all `rep` in `reps`, and checking whether we've encountered it before
+    during this search, or whether it exists in `reps_to_sinks`. If so, we can assume equivalence
     to the sink representation it's referring to. If not, we have to expand on it.
-    To do so, we use `prime_reductibles`, to see if we can reduce `rep` to other equivalent representations.
-    This is done recursively, such that by the end, we will have collected all new equivalent representations,
+    To do so, we use `prime_automaton` to find all occurrences of prime reductibles in `rep`,
+    to see if we can reduce `rep` to other equivalent representations, which we then expand on as well.
+    This is done depth first, such that by the end, we will have collected all new equivalent representations,
     plus the sink representations of the ones we have seen before. This might include more than one sink state.
     If that if the case, we have discovered that two former sink states are actually different representations
     for the same element, but this function doesn't process that information.
 
+    Instead of recursing for every rep we can reduce, we keep a stack of reps we still have to expand on,
+    so long reduction chains don't pile up call frames.
 
     Parameters
     ----------
     reps : strings
         Some collection of equivalent representations.
-    reps_to_sinks : dict[str, str]
+    reps_to_sinks : Mapping[str, str]
         Already assumed equivalences.
-    prime_reductibles : set[str]
-        When reducing representations in `reps`, only these reductibles will be used.
-    all_equivalent_reps : set[str] | None, optional
-        Representations that we have found to be equivalent in this recursive search, by default None.
+    prime_automaton : RuleAutomaton
+        When reducing representations in `reps`, only the reductibles in this automaton will be used.
+    exclude : str | None, optional
+        A rep that we are not allowed to use, neither as a reductible nor to go straight to its sink,
+        by default None.
+    target : str | None, optional
+        If we're only interested in whether we can reach this rep, we stop searching as soon as we do,
+        in which case the returned set is incomplete, by default None.
 
     Returns
     -------
@@ -557,30 +858,40 @@ def find_all_reachable_representations(
         The union of the input, all possible reduced representations that we haven't seen before,
         and the sink representations of the ones we have seen before.
     """
-    if all_equivalent_reps is None:
-        all_equivalent_reps = set()
-
-    for rep in reps:
+    all_equivalent_reps: set[str] = set()
+
+    # Local references to the methods we call in the loop below, saving an attribute lookup per call
+    get_sink = reps_to_sinks.get
+    add = all_equivalent_reps.add
+    matches = prime_automaton.matches
+
+    to_visit: list[str] = list(reps)
+    pop = to_visit.pop
+    extend = to_visit.extend
+    while to_visit:
+        rep = pop()
         if rep in all_equivalent_reps:
             continue
 
-        all_equivalent_reps.add(rep)
+        add(rep)
+        if rep == target:
+            break
 
         # If `rep` already has an associated sink, go straight to the sink
-        if rep in reps_to_sinks:
-            all_equivalent_reps.add(reps_to_sinks[rep])
+        sink = get_sink(rep)
+        if sink is not None and rep != exclude:
+            add(sink)
+            if sink == target:
+                break
             continue
 
-        # Otherwise we try to recude `rep` with `prime_reductibles`
-        for left in prime_reductibles:
-            right = reps_to_sinks[left]
-            reps_after_application = apply_rule_once(left, right, rep)
-
-            find_all_reachable_representations(
-                reps_after_application,
-                reps_to_sinks,
-                prime_reductibles,
-                all_equivalent_reps,
-            )
+        # Otherwise we try to recude `rep` with every occurrence of a prime reductible in it
+        extend(
+            {
+                rep[:start] + get_sink(left) + rep[end:]
+                for start, end, left in matches(rep)
+                if left != exclude
+            }
+        )
 
     return all_equivalent_reps
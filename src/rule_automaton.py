@@ -0,0 +1,115 @@
+from collections import deque
+from typing import Iterable
+
+
+class RuleAutomaton:
+    """Aho-Corasick automaton over the left-hand sides of a collection of reduction rules.
+
+    To find all ways to apply a rule once to some rep, we would normally search the rep for every rule
+    separately. This automaton finds all occurrences of all rules in a single pass over the rep instead.
+
+    The automaton is a trie of all left-hand sides, where every state also has a failure link to the state
+    representing the longest proper suffix of its own string that is still in the trie,
+    such that we never have to go back in the rep we're scanning.
+    Those failure links are then folded into a complete transition table, turning it into a DFA,
+    such that scanning a rep takes exactly one lookup per character.
+
+    The same reps get scanned over and over while we infer a group structure, so the matches
+    for every scanned string are cached for the lifetime of the automaton.
+    """
+
+    def __init__(self, lefts: Iterable[str]) -> None:
+        """Builds the automaton.
+
+        Parameters
+        ----------
+        lefts : Iterable[str]
+            Non-empty left-hand sides of the rules, which are the strings we want to find.
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        # For every state, where to go on every character that occurs in any of `lefts`, failure links included.
+        # Characters that don't occur in any of `lefts` always lead back to the root.
+        self._transitions: list[dict[str, int]] = []
+        self._fail: list[int] = [0]
+        # For every state, the lengths and left-hand sides of all rules that end there
+        self._outputs: list[tuple[tuple[int, str], ...]] = [()]
+        self._matches_cache: dict[str, list[tuple[int, int, str]]] = {}
+
+        # First build the trie
+        for left in lefts:
+            state = 0
+            for char in left:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._outputs[state] += ((len(left), left),)
+
+        # Then add the failure links breadth first, such that the failure link of a state always points
+        # to a state that has been processed already. States at depth 1 fail to the root.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                # Anything we find from the failure state, we also find from here
+                self._outputs[next_state] += self._outputs[self._fail[next_state]]
+
+        # Finally fold the failure links into the transitions, again breadth first, such that
+        # the transitions of the failure state of a state are always complete already
+        self._transitions = [{} for _ in self._goto]
+        self._transitions[0] = dict(self._goto[0])
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            queue.extend(self._goto[state].values())
+            self._transitions[state] = {
+                **self._transitions[self._fail[state]],
+                **self._goto[state],
+            }
+
+    def matches(self, s: str) -> list[tuple[int, int, str]]:
+        """Finds all occurrences of all left-hand sides in `s`, including overlapping ones.
+
+        Parameters
+        ----------
+        s : str
+            The string to scan.
+
+        Returns
+        -------
+        list[tuple[int, int, str]]
+            The start index, end index and left-hand side of every occurrence, such that
+            `s[start:end] == left`, and we can replace it without computing its length again.
+
+        Examples
+        --------
+        >>> RuleAutomaton(["HH", "Hr"]).matches("HHHr")
+        [(0, 2, 'HH'), (1, 3, 'HH'), (2, 4, 'Hr')]
+        """
+        if s in self._matches_cache:
+            return self._matches_cache[s]
+
+        transitions = self._transitions
+        outputs = self._outputs
+
+        found: list[tuple[int, int, str]] = []
+        state = 0
+        for end, char in enumerate(s, 1):
+            state = transitions[state].get(char, 0)
+
+            for length, left in outputs[state]:
+                found.append((end - length, end, left))
+
+        self._matches_cache[s] = found
+        return found
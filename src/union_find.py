@@ -0,0 +1,170 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator
+
+
+class UnionFind(Mapping[str, str]):
+    """Disjoint-set forest keeping track of which representations are known to be equivalent.
+
+    Every rep we register is interned into an integer id, and every equivalence class is a tree of ids.
+    The root of every tree keeps track of the sink of its class, so looking up the sink of a rep means walking up
+    to the root of its tree. Merging two classes just means hanging one root under the other,
+    instead of rewriting a reference for every rep in one of the classes.
+    Which root we hang under which is decided by their rank, such that trees stay shallow,
+    while which sink survives is decided by the sort key, independently of the shape of the trees.
+    The rep strings themselves are interned with `sys.intern` as well, so all sinks we hand out
+    are shared string objects, whose hash only ever has to be computed once.
+
+    It can be read like a `dict` that maps every registered rep to its sink, which is how it is used
+    in `find_all_reachable_representations`.
+    """
+
+    def __init__(self, key: Callable[[str], Any]) -> None:
+        """Initiates an empty forest.
+
+        Parameters
+        ----------
+        key : Callable[[str], Any]
+            Sort key that decides which of two sinks survives when their classes are merged.
+            The rep with the smallest key becomes the sink of the merged class.
+        """
+        self._key: Callable[[str], Any] = key
+
+        self._ids: dict[str, int] = {}
+        self._reps: list[str] = []
+        self._parent: list[int] = []
+        # Upper bound on the height of the tree of every root, only meaningful for roots
+        self._rank: list[int] = []
+        # The id of the sink of the class of every root, only meaningful for roots
+        self._sink: list[int] = []
+
+        # For every root, the ids of all reps in its class, so we know whose sink changes upon merging
+        self._members: dict[int, list[int]] = {}
+
+        self.sinks: set[str] = set()
+
+    def __getitem__(self, rep: str) -> str:
+        """Returns the sink of `rep`, raising a `KeyError` if we haven't registered `rep`."""
+        return self._reps[self._sink[self._find(self._ids[rep])]]
+
+    def get(self, rep: str, default: str | None = None) -> str | None:
+        """Returns the sink of `rep`, or `default` if we haven't registered `rep`.
+
+        Does the same as `Mapping.get`, but with a single lookup instead of going through `__getitem__`
+        and catching the `KeyError`.
+        """
+        rid = self._ids.get(rep)
+        if rid is None:
+            return default
+        return self._reps[self._sink[self._find(rid)]]
+
+    def __contains__(self, rep: object) -> bool:
+        return rep in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, rep: str, sink: str | None = None) -> None:
+        """Registers `rep`, either as a new sink, or as a member of the class of `sink`.
+
+        Parameters
+        ----------
+        rep : str
+            The representation to register, which should not have been registered before.
+        sink : str | None, optional
+            A rep whose class `rep` should join, without changing the sink of that class.
+            If `sink` hasn't been registered either, it is registered as a new sink first.
+            By default None, meaning `rep` becomes a sink itself.
+        """
+        if sink is not None and sink not in self._ids:
+            self.add(sink)
+
+        rep = sys.intern(rep)
+        rid = len(self._reps)
+        self._ids[rep] = rid
+        self._reps.append(rep)
+        self._rank.append(0)
+        self._sink.append(rid)
+
+        if sink is None:
+            self._parent.append(rid)
+            self._members[rid] = [rid]
+            self.sinks.add(rep)
+            return
+
+        root = self._find(self._ids[sink])
+        self._parent.append(root)
+        self._members[root].append(rid)
+        if self._rank[root] == 0:
+            self._rank[root] = 1
+
+    def union(self, rep1: str, rep2: str) -> list[str]:
+        """Merges the classes of `rep1` and `rep2`, which should both be registered.
+
+        Parameters
+        ----------
+        rep1 : str
+            A rep in the first class.
+        rep2 : str
+            A rep in the second class.
+
+        Returns
+        -------
+        list[str]
+            All reps whose sink changed, which is empty if they were already in the same class.
+        """
+        root1 = self._find(self._ids[rep1])
+        root2 = self._find(self._ids[rep2])
+        if root1 == root2:
+            return []
+
+        # The most reduced of both sinks stays a sink, and the members of the other class move to it
+        sink1 = self._sink[root1]
+        sink2 = self._sink[root2]
+        if self._key(self._reps[sink2]) < self._key(self._reps[sink1]):
+            sink1, sink2 = sink2, sink1
+            moved_root = root1
+        else:
+            moved_root = root2
+        self.sinks.remove(self._reps[sink2])
+        moved = [self._reps[rid] for rid in self._members[moved_root]]
+
+        # The root with the lowest rank goes under the other one, regardless of which sink survived
+        if self._rank[root1] < self._rank[root2]:
+            root1, root2 = root2, root1
+        elif self._rank[root1] == self._rank[root2]:
+            self._rank[root1] += 1
+        self._parent[root2] = root1
+        self._sink[root1] = sink1
+
+        members = self._members.pop(root2)
+        self._members[root1].extend(members)
+
+        return moved
+
+    def _find(self, rid: int) -> int:
+        """Returns the root of the tree containing `rid`, pointing every visited id straight to it.
+
+        Parameters
+        ----------
+        rid : int
+            Id of a registered rep.
+
+        Returns
+        -------
+        int
+            Id of the root of the tree, whose sink is the sink of the class of `rid`.
+        """
+        parent = self._parent
+        root = rid
+        while parent[root] != root:
+            root = parent[root]
+
+        # Path compression, so the next lookup for anything on this path is a single step
+        while parent[rid] != root:
+            parent[rid], rid = root, parent[rid]
+
+        return root
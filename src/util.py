@@ -1,9 +1,14 @@
 from functools import lru_cache
 import re
 
+# A character followed by a power, like "H4"
+_POWER_PATTERN = re.compile(r"([a-zA-Z])(\d+)")
+# A repeated character, like "HHHH"
+_REPETITION_PATTERN = re.compile(r"([a-zA-Z])\1+")
+
 
 @lru_cache(maxsize=None)
-def generate_contractions(s1: str, s2: str) -> set[str]:
+def generate_contractions(s1: str, s2: str) -> frozenset[str]:
     """Generates all possible overlaps between two strings.
 
     Parameters
@@ -15,21 +20,22 @@ def generate_contractions(s1: str, s2: str) -> set[str]:
 
     Returns
     -------
-    set[str]
-        All possible overlaps.
+    frozenset[str]
+        All possible overlaps. Frozen, because the same object is handed out again for every cache hit.
 
     Examples
     --------
     >>> s1 = "Hrr"
     >>> s2 = "rrH"
-    >>> generate_contractions(s1, s2)
-    {'HrrH', 'rrHrr', 'HrrrH'}
+    >>> sorted(generate_contractions(s1, s2))
+    ['HrrH', 'HrrrH', 'rrHrr']
     """
     max_len: int = min(len(s1), len(s2))
     contractions: set[str] = set()
 
-    # Check for equality for all sizes `overlap`, both ways around
-    for overlap in range(max_len):
+    # Check for equality for all sizes `overlap`, both ways around. An overlap of 0 would mean
+    # comparing the whole of one string with the empty string (because `s[-0:] == s`), which never matches.
+    for overlap in range(1, max_len):
         end_of_s1: str = s1[-overlap:]
         start_of_s2: str = s2[:overlap]
 
@@ -43,11 +49,11 @@ def generate_contractions(s1: str, s2: str) -> set[str]:
             contraction: str = s2 + s1[overlap:]
             contractions.add(contraction)
 
-    return contractions
+    return frozenset(contractions)
 
 
 @lru_cache(maxsize=None)
-def apply_rule_once(unreduced: str, reduced: str, s: str) -> set[str]:
+def apply_rule_once(unreduced: str, reduced: str, s: str) -> frozenset[str]:
     """Returns all representations we can reach by applying `rule` once to `s`.
 
     Any occurence of `unreduced` within `s` will lead to one element in the returned list.
@@ -64,7 +70,7 @@ def apply_rule_once(unreduced: str, reduced: str, s: str) -> set[str]:
 
     Returns
     -------
-    set[str]
+    frozenset[str]
         The possible reductions.
 
     Examples
@@ -72,8 +78,8 @@ def apply_rule_once(unreduced: str, reduced: str, s: str) -> set[str]:
     >>> unreduced = "HH"
     >>> reduced = ""
     >>> s = "HHrHH"
-    >>> print(apply_rule_once(unreduced, reduced, s))
-    {"HHr", "rHH"}
+    >>> sorted(apply_rule_once(unreduced, reduced, s))
+    ['HHr', 'rHH']
     """
     results: set[str] = set()
     start = 0
@@ -81,11 +87,11 @@ def apply_rule_once(unreduced: str, reduced: str, s: str) -> set[str]:
         new_string = s[:index] + reduced + s[index + len(unreduced) :]
         results.add(new_string)
         start = index + 1
-    return results
+    return frozenset(results)
 
 
 @lru_cache(maxsize=None)
-def get_most_shaveds(s1: str, s2: str) -> set[tuple[str, str]]:
+def get_most_shaveds(s1: str, s2: str) -> frozenset[tuple[str, str]]:
     """Returns `s1` and `s2`, but without any characters that `s1` and `s2` both end or both start with.
 
     This can lead to different outcomes depending on whether you start from left or right,
@@ -100,20 +106,20 @@ def get_most_shaveds(s1: str, s2: str) -> set[tuple[str, str]]:
 
     Returns
     -------
-    set[tuple[str, str]]
+    frozenset[tuple[str, str]]
         Set of tuples of shaved strings.
 
     Examples
     --------
     >>> s1 = "HH"
     >>> s2 = ""
-    >>> get_most_shaveds(s1, s2)
-    {('HH', '')}
+    >>> sorted(get_most_shaveds(s1, s2))
+    [('HH', '')]
 
     >>> s1 = "rrHrr"
     >>> s2 = "rr"
-    >>> get_most_shaveds(s1, s2)
-    {('rrH', ''), ('Hrr', '')}
+    >>> sorted(get_most_shaveds(s1, s2))
+    [('Hrr', ''), ('rrH', '')]
     """
     # Left first
     limit: int = min(len(s1), len(s2))
@@ -136,7 +142,7 @@ def get_most_shaveds(s1: str, s2: str) -> set[tuple[str, str]]:
     # If both of the shaved representations are non-empty, we will find the same results
     # if we start from the other side, so we can just return the result now
     if len(most_shaved_left_first) > 0 and len(most_shaved_left_first[1]) > 0:
-        return {most_shaved_left_first}
+        return frozenset((most_shaved_left_first,))
 
     # Otherwise we do the same starting from the right. Of course we need to reset `limit` to 0
     limit: int = min(len(s1), len(s2))
@@ -154,7 +160,7 @@ def get_most_shaveds(s1: str, s2: str) -> set[tuple[str, str]]:
         s2[overlap_left : len(s2) - overlap_right],
     )
 
-    return {most_shaved_left_first, most_shaved_right_first}
+    return frozenset((most_shaved_left_first, most_shaved_right_first))
 
 
 @lru_cache(maxsize=None)
@@ -199,11 +205,15 @@ def expand_notation(s: str) -> str:
             f'{s = } should not contain the letter "E", because we would need "e" to represent its inverse, but "e" is reserved for the identity element'
         )
 
+    # Representations that are already expanded don't need any processing
+    if s.isalpha() and "e" not in s:
+        return s
+
     # Replace all occurences of "e", representing the identity element, with the empty string
     s = s.replace("e", "")
 
     # H4r2 -> HHHHrr
-    expanded = re.sub(r"([a-zA-Z])(\d+)", lambda m: m.group(1) * int(m.group(2)), s)
+    expanded = _POWER_PATTERN.sub(lambda m: m.group(1) * int(m.group(2)), s)
 
     if expanded and not expanded.isalpha():
         raise SyntaxError(
@@ -244,8 +254,8 @@ def compress_notation(s: str) -> str:
         return "e"
 
     # HHHHrr -> H4r2
-    compressed = re.sub(
-        r"([a-zA-Z])\1+", lambda m: f"{m.group(0)[0]}{len(m.group(0))}", s
+    compressed = _REPETITION_PATTERN.sub(
+        lambda m: f"{m.group(0)[0]}{len(m.group(0))}", s
     )
     return compressed
 
@@ -272,9 +282,7 @@ def anti_cap(s: str) -> str:
     'r'
     """
     assert len(s) == 1, "expecting single character"
-    if s.islower():
-        return s.capitalize()
-    return s.lower()
+    return s.swapcase()
 
 
 @lru_cache
@@ -292,4 +300,6 @@ def get_inverse_rep(s: str) -> str:
         Inverse.
     """
     s_expanded = expand_notation(s)
-    return "".join(anti_cap(c) for c in reversed(s_expanded))
+
+    # `str.swapcase` inverts the case of all characters at once, instead of calling `anti_cap` per character
+    return s_expanded[::-1].swapcase()
@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from src.group import Group
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presentations together with the order of the group they describe
+PRESENTATIONS = [
+    ([["H2", "r3", "e"], ["Hr", "rrH"]], 6),
+    ([["H2", "e"], ["Hr", "r3H"]], 16),
+    ([["H2", "e"], ["r5", "e"], ["Hr", "r4H"]], 10),
+    ([["a3", "e"], ["b2", "e"], ["abab", "ba"]], 1),
+    ([["a5", "e"], ["b4", "e"], ["bba", "b"]], 1),
+    ([["a3", "b2", "e"], ["abab", "ba"]], 1),
+    ([["a4", "b4", "e"], ["abaa", "b"]], 4),
+    ([["a6", "e"], ["b2", "a3"], ["Bab", "A"]], 12),
+    ([["a2", "e"], ["b3", "e"], ["abAb", "a"]], 1),
+    ([["a3", "e"], ["b4", "e"], ["aaab", "abb"]], 1),
+    ([["a6", "e"], ["b4", "e"], ["bbaaa", "b"]], 6),
+]
+
+
+def count_sinks_with_hash_seed(hash_seed: int) -> list[int]:
+    """Counts the sinks for all `PRESENTATIONS` in a fresh interpreter, because the hash seed,
+    and with it the order in which sets are iterated, can only be set when the interpreter starts.
+    """
+    script = (
+        "import json, sys\n"
+        "from src.group import Group\n"
+        "presentations = json.loads(sys.argv[1])\n"
+        "print(json.dumps([len(Group(reps)._reps_to_sinks.sinks) for reps in presentations]))\n"
+    )
+    presentations = [reps for reps, _ in PRESENTATIONS]
+    completed = subprocess.run(
+        [sys.executable, "-c", script, json.dumps(presentations)],
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONHASHSEED": str(hash_seed)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+class GroupTests(unittest.TestCase):
+    def test_sinks(self):
+        for reps, order in PRESENTATIONS:
+            # create
+            group = Group(reps)
+
+            # check
+            self.assertTrue(group.is_complete())
+            self.assertEqual(len(group._reps_to_sinks.sinks), order)
+            for sink in group._reps_to_sinks.sinks:
+                for prime in group._prime_reductibles:
+                    self.assertNotIn(prime, sink)
+            # Applying a prime reductible to a rep shouldn't lead to a rep in a different class
+            for rep, sink in group._reps_to_sinks.items():
+                for start, end, left in group._get_prime_automaton().matches(rep):
+                    reduced = rep[:start] + group._reps_to_sinks[left] + rep[end:]
+                    self.assertEqual(group._reps_to_sinks.get(reduced, sink), sink)
+
+    def test_sinks_across_hash_seeds(self):
+        orders = [order for _, order in PRESENTATIONS]
+        for hash_seed in range(10):
+            # create
+            nrs_of_sinks = count_sinks_with_hash_seed(hash_seed)
+
+            # check
+            self.assertEqual(nrs_of_sinks, orders, f"{hash_seed = }")
+
+    def test_get_sink_for(self):
+        # create
+        group = Group([["a5", "e"], ["b4", "e"], ["bba", "b"]])
+        sink_aa = group.get_sink_for("aa")
+        sink_bab = group.get_sink_for("bab")
+
+        # check
+        self.assertEqual(sink_aa, "")
+        self.assertEqual(sink_bab, "")
+
+    def test_get_inverse_of(self):
+        # create
+        group = Group([["H2", "r3", "e"], ["Hr", "rrH"]])
+        inverse_r = group.get_inverse_of("r")
+        inverse_Hr = group.get_inverse_of("Hr")
+
+        # check
+        self.assertEqual(inverse_r, group.get_sink_for("r2"))
+        self.assertEqual(group.get_sink_for("Hr" + inverse_Hr), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
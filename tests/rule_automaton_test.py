@@ -0,0 +1,43 @@
+import unittest
+
+from src.rule_automaton import RuleAutomaton
+
+
+class RuleAutomatonTests(unittest.TestCase):
+    def test_matches(self):
+        # create
+        automaton = RuleAutomaton(["HH", "Hr", "rrr", "rHr"])
+        HH_HH_Hr = automaton.matches("HHHr")
+        rrr_rrr = automaton.matches("rrrr")
+        Hr_rHr = automaton.matches("rHr")
+        empty = automaton.matches("")
+        nothing = automaton.matches("RRhR")
+
+        # check
+        self.assertCountEqual(HH_HH_Hr, [(0, 2, "HH"), (1, 3, "HH"), (2, 4, "Hr")])
+        self.assertCountEqual(rrr_rrr, [(0, 3, "rrr"), (1, 4, "rrr")])
+        self.assertCountEqual(Hr_rHr, [(1, 3, "Hr"), (0, 3, "rHr")])
+        self.assertCountEqual(empty, [])
+        self.assertCountEqual(nothing, [])
+
+    def test_matches_suffixes(self):
+        # create
+        automaton = RuleAutomaton(["abcd", "bc", "c"])
+        matches = automaton.matches("abcd")
+
+        # check
+        self.assertCountEqual(matches, [(0, 4, "abcd"), (1, 3, "bc"), (2, 3, "c")])
+
+    def test_matches_after_mismatch(self):
+        # create
+        automaton = RuleAutomaton(["aab", "ab", "ba"])
+        matches = automaton.matches("aaabxaba")
+
+        # check
+        self.assertCountEqual(
+            matches, [(1, 4, "aab"), (2, 4, "ab"), (5, 7, "ab"), (6, 8, "ba")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from src.union_find import UnionFind
+
+
+def sort_key(s: str) -> tuple[int, str]:
+    return (len(s), s)
+
+
+class UnionFindTests(unittest.TestCase):
+    def test_add(self):
+        # create
+        reps_to_sinks = UnionFind(sort_key)
+        reps_to_sinks.add("")
+        reps_to_sinks.add("HH", "")
+        reps_to_sinks.add("Hr", "rrH")
+
+        # check
+        self.assertEqual(reps_to_sinks["HH"], "")
+        self.assertEqual(reps_to_sinks["Hr"], "rrH")
+        self.assertEqual(reps_to_sinks["rrH"], "rrH")
+        self.assertEqual(reps_to_sinks.sinks, {"", "rrH"})
+        self.assertEqual(len(reps_to_sinks), 4)
+        self.assertNotIn("H", reps_to_sinks)
+
+    def test_get(self):
+        # create
+        reps_to_sinks = UnionFind(sort_key)
+        reps_to_sinks.add("")
+        reps_to_sinks.add("HH", "")
+
+        # check
+        self.assertEqual(reps_to_sinks.get("HH"), "")
+        self.assertEqual(reps_to_sinks.get(""), "")
+        self.assertIsNone(reps_to_sinks.get("H"))
+        self.assertEqual(reps_to_sinks.get("H", "r"), "r")
+
+    def test_union(self):
+        # create
+        reps_to_sinks = UnionFind(sort_key)
+        reps_to_sinks.add("")
+        reps_to_sinks.add("rrr", "")
+        reps_to_sinks.add("rrH")
+        reps_to_sinks.add("Hr", "rrH")
+        moved = reps_to_sinks.union("Hr", "")
+        moved_again = reps_to_sinks.union("rrH", "rrr")
+
+        # check
+        self.assertCountEqual(moved, ["rrH", "Hr"])
+        self.assertEqual(moved_again, [])
+        self.assertEqual(reps_to_sinks["Hr"], "")
+        self.assertEqual(reps_to_sinks["rrH"], "")
+        self.assertEqual(reps_to_sinks.sinks, {""})
+
+    def test_union_keeps_most_reduced_sink(self):
+        # create
+        reps_to_sinks = UnionFind(sort_key)
+        reps_to_sinks.add("rrH")
+        reps_to_sinks.add("Hr", "rrH")
+        reps_to_sinks.add("rHrr", "rrH")
+        reps_to_sinks.add("H")
+        moved = reps_to_sinks.union("H", "Hr")
+        reps_to_sinks.add("HHr", "rHrr")
+
+        # check
+        self.assertCountEqual(moved, ["rrH", "Hr", "rHrr"])
+        self.assertEqual(reps_to_sinks["rrH"], "H")
+        self.assertEqual(reps_to_sinks["rHrr"], "H")
+        self.assertEqual(reps_to_sinks["HHr"], "H")
+        self.assertEqual(reps_to_sinks.sinks, {"H"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,6 +34,22 @@ class UtilTests(unittest.TestCase):
         self.assertEqual(Hr_empty_rH_empty, {("Hr", ""), ("rH", "")})
         self.assertEqual(H_empty, {("H", "")})
 
+    def test_generate_contractions(self):
+        # create
+        HrrH_rrHrr_HrrrH = util.generate_contractions("Hrr", "rrH")
+        HHH = util.generate_contractions("HH", "HH")
+        aba_bab = util.generate_contractions("ab", "ba")
+        nothing = util.generate_contractions("Hr", "HR")
+        nothing2 = util.generate_contractions("H", "H")
+
+        # check
+        self.assertEqual(HrrH_rrHrr_HrrrH, {"HrrH", "rrHrr", "HrrrH"})
+        self.assertEqual(HHH, {"HHH"})
+        self.assertEqual(aba_bab, {"aba", "bab"})
+        self.assertEqual(nothing, set())
+        self.assertEqual(nothing2, set())
+        self.assertIsInstance(HrrH_rrHrr_HrrrH, frozenset)
+
     def test_apply_rule_once(self):
         # create
         ba_ab = util.apply_rule_once("aa", "b", "aaa")
@@ -76,6 +92,28 @@ class UtilTests(unittest.TestCase):
         self.assertEqual(H2, "H2")
         self.assertEqual(r2H, "r2H")
 
+    def test_anti_cap(self):
+        # create
+        R = util.anti_cap("r")
+        r = util.anti_cap("R")
+
+        # check
+        self.assertEqual(R, "R")
+        self.assertEqual(r, "r")
+        with self.assertRaises(AssertionError):
+            util.anti_cap("rH")
+
+    def test_get_inverse_rep(self):
+        # create
+        hR = util.get_inverse_rep("rH")
+        RRRh = util.get_inverse_rep("Hr3")
+        empty = util.get_inverse_rep("e")
+
+        # check
+        self.assertEqual(hR, "hR")
+        self.assertEqual(RRRh, "RRRh")
+        self.assertEqual(empty, "")
+
 
 if __name__ == "__main__":
     unittest.main()